@@ -1,265 +1,486 @@
-# plots.py
-import pandas as pd
-import plotly.express as px
-
-# ---------- shared styling helpers ----------
-
-DEFAULT_TEMPLATE = "plotly_white"
-
-def _style_fig(fig, title=None, height=360):
-    """Uniform look & feel for all charts."""
-    if title:
-        fig.update_layout(title=dict(text=title, x=0.02, xanchor="left"))
-    fig.update_layout(
-        template=DEFAULT_TEMPLATE,
-        height=height,
-        margin=dict(t=60, r=16, b=16, l=16),
-        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="left", x=0),
-        hovermode="closest",
-        bargap=0.15,
-        font=dict(size=12),
-    )
-    return fig
-
-def _ensure_cols(df: pd.DataFrame, cols):
-    missing = [c for c in cols if c not in df.columns]
-    if missing:
-        raise ValueError(f"Missing required columns: {missing}")
-
-
-# ---------- KPI cards (numbers to show in st.metric) ----------
-
-def kpi_total_sales(df: pd.DataFrame) -> float:
-    """Total sales across all rows."""
-    _ensure_cols(df, ["Item_Outlet_Sales"])
-    return float(pd.to_numeric(df["Item_Outlet_Sales"], errors="coerce").sum())
-
-def kpi_avg_sales_per_item(df: pd.DataFrame) -> float:
-    """Average sales per row/item."""
-    _ensure_cols(df, ["Item_Outlet_Sales"])
-    s = pd.to_numeric(df["Item_Outlet_Sales"], errors="coerce")
-    return float(s.mean())
-
-def kpi_highest_selling_category(df: pd.DataFrame, cat_col: str = "Item_Type") -> dict:
-    """Highest selling product category (by total sales)."""
-    _ensure_cols(df, ["Item_Outlet_Sales", cat_col])
-    g = (
-        df.groupby(cat_col, dropna=False)["Item_Outlet_Sales"]
-        .sum()
-        .sort_values(ascending=False)
-    )
-    if g.empty:
-        return {"category": None, "total_sales": 0.0}
-    return {"category": g.index[0], "total_sales": float(g.iloc[0])}
-
-def kpi_best_outlet(df: pd.DataFrame) -> dict:
-    """Best performing outlet (Outlet_Identifier if present, else Outlet_Type)."""
-    outlet_col = "Outlet_Identifier" if "Outlet_Identifier" in df.columns else "Outlet_Type"
-    _ensure_cols(df, ["Item_Outlet_Sales", outlet_col])
-    g = (
-        df.groupby(outlet_col, dropna=False)["Item_Outlet_Sales"]
-        .sum()
-        .sort_values(ascending=False)
-    )
-    if g.empty:
-        return {"outlet": None, "total_sales": 0.0}
-    return {"outlet": g.index[0], "total_sales": float(g.iloc[0])}
-
-
-# ---------- Line chart (trend) ----------
-
-def fig_sales_trend(
-    df: pd.DataFrame, date_col: str | None = None, freq: str = "M"
-):
-    """
-    Sales trend over time.
-    - If `date_col` provided and exists: group by period (freq='M','Q','Y').
-    - Else if 'Outlet_Establishment_Year' exists: line over that year.
-    - Else: fallback to index order (not a real time series, but shows progression).
-    """
-    _ensure_cols(df, ["Item_Outlet_Sales"])
-    s = pd.to_numeric(df["Item_Outlet_Sales"], errors="coerce")
-
-    if date_col and date_col in df.columns:
-        dt = pd.to_datetime(df[date_col], errors="coerce")
-        d = (
-            pd.DataFrame({"_dt": dt, "sales": s})
-            .dropna(subset=["_dt"])
-            .groupby(pd.Grouper(key="_dt", freq=freq))
-            .sum()
-            .reset_index()
-            .rename(columns={"sales": "total_sales"})
-        )
-        fig = px.line(d, x="_dt", y="total_sales", markers=True)
-        return _style_fig(fig, f"Sales Trend ({freq}-periods)")
-    elif "Outlet_Establishment_Year" in df.columns:
-        d = (
-            df.assign(_yr=pd.to_numeric(df["Outlet_Establishment_Year"], errors="coerce"))
-            .dropna(subset=["_yr"])
-            .groupby("_yr")["Item_Outlet_Sales"].sum()
-            .reset_index(name="total_sales")
-        )
-        fig = px.line(d, x="_yr", y="total_sales", markers=True)
-        fig.update_xaxes(title="Year")
-        return _style_fig(fig, "Sales by Outlet Establishment Year")
-    else:
-        d = (
-            pd.DataFrame({"idx": range(len(df)), "sales": s})
-            .groupby("idx")
-            .sum()
-            .reset_index()
-            .rename(columns={"sales": "total_sales"})
-        )
-        fig = px.line(d, x="idx", y="total_sales", markers=True)
-        fig.update_xaxes(title="Index (no date column found)")
-        return _style_fig(fig, "Sales Trend (Index Order)")
-
-
-# ---------- Sales distribution by price (Item_MRP) ----------
-
-def fig_mrp_distribution(df: pd.DataFrame, bins: int = 30, show_quantiles: bool = True):
-    """
-    Histogram of Item_MRP to reveal price clusters; quantile lines highlight 'sweet spots'.
-    """
-    _ensure_cols(df, ["Item_MRP"])
-    fig = px.histogram(df, x="Item_MRP", nbins=bins, opacity=0.9)
-    fig.update_yaxes(title="Count")
-    if show_quantiles and df["Item_MRP"].notna().any():
-        q = df["Item_MRP"].quantile([0.25, 0.5, 0.75]).to_dict()
-        labels = {0.25: "Q1", 0.5: "Median", 0.75: "Q3"}
-        for quant, label in q.items():
-            fig.add_vline(
-                x=label,
-                line_dash="dot",
-                opacity=0.6,
-                annotation_text=labels[float(quant)],
-                annotation_position="top",
-            )
-    return _style_fig(fig, "Sales Distribution by Item_MRP (Pricing Landscape)")
-
-
-# ---------- Bar charts (comparisons) ----------
-
-def _bar_series(df: pd.DataFrame, group_col: str, top_n: int | None = None, horizontal=True):
-    _ensure_cols(df, ["Item_Outlet_Sales", group_col])
-    g = (
-        df.groupby(group_col, dropna=False)["Item_Outlet_Sales"]
-        .sum()
-        .sort_values(ascending=False)
-        .reset_index(name="total_sales")
-    )
-    if top_n:
-        g = g.head(top_n)
-    # preserve sort order in categorical axis
-    order = g[group_col].astype(str).tolist()
-
-    if horizontal:
-        fig = px.bar(
-            g, x="total_sales", y=group_col,
-            orientation="h",
-            category_orders={group_col: order},
-            labels={"total_sales": "Total Sales"}
-        )
-    else:
-        fig = px.bar(
-            g, x=group_col, y="total_sales",
-            category_orders={group_col: order},
-            labels={"total_sales": "Total Sales"}
-        )
-    return fig
-
-def fig_sales_by_item_type(df: pd.DataFrame, top_n: int | None = None):
-    fig = _bar_series(df, "Item_Type", top_n=top_n, horizontal=True)
-    return _style_fig(fig, "Total Sales by Item Type")
-
-def fig_sales_by_outlet_type(df: pd.DataFrame):
-    fig = _bar_series(df, "Outlet_Type", top_n=None, horizontal=False)
-    return _style_fig(fig, "Total Sales by Outlet Type")
-
-def fig_sales_by_outlet_size(df: pd.DataFrame):
-    fig = _bar_series(df, "Outlet_Size", top_n=None, horizontal=False)
-    return _style_fig(fig, "Total Sales by Outlet Size")
-
-
-# ---------- Pie / Donut (proportions) ----------
-
-def fig_location_contribution(df: pd.DataFrame, hole: float = 0.5):
-    """
-    Sales share by Outlet_Location_Type (Tier 1/2/3).
-    """
-    _ensure_cols(df, ["Item_Outlet_Sales", "Outlet_Location_Type"])
-    g = (
-        df.groupby("Outlet_Location_Type", dropna=False)["Item_Outlet_Sales"]
-        .sum()
-        .reset_index(name="total_sales")
-    )
-    fig = px.pie(g, names="Outlet_Location_Type", values="total_sales", hole=hole)
-    fig.update_traces(textposition="inside", textinfo="percent+label")
-    return _style_fig(fig, "Sales Share by Location (Tier)", height=380)
-
-
-# ---------- Scatter (visibility impact) ----------
-
-def fig_visibility_scatter(df: pd.DataFrame, color: str = "Item_Type"):
-    """
-    Item_Visibility vs Item_Outlet_Sales, colored by product category.
-    """
-    _ensure_cols(df, ["Item_Visibility", "Item_Outlet_Sales"])
-    hover = ["Outlet_Type", "Outlet_Location_Type"] if "Outlet_Type" in df.columns and "Outlet_Location_Type" in df.columns else None
-    fig = px.scatter(
-        df,
-        x="Item_Visibility",
-        y="Item_Outlet_Sales",
-        color=color if color in df.columns else None,
-        opacity=0.6,
-        hover_data=hover,
-        trendline=None,  # set to 'ols' if statsmodels installed and you want a fitted line
-    )
-    fig.update_xaxes(title="Item Visibility")
-    fig.update_yaxes(title="Item Outlet Sales")
-    return _style_fig(fig, "Visibility vs Sales (Scatter)")
-
-
-# ---------- Box plot (spread & outliers) ----------
-
-def fig_sales_box_by_category(df: pd.DataFrame, cat_col: str = "Item_Type", log_y: bool = False):
-    """
-    Distribution of sales per category to inspect spread & outliers.
-    """
-    _ensure_cols(df, ["Item_Outlet_Sales", cat_col])
-    fig = px.box(df, x=cat_col, y="Item_Outlet_Sales", points=False)
-    if log_y:
-        fig.update_yaxes(type="log")
-    fig.update_xaxes(title=cat_col.replace("_", " "))
-    fig.update_yaxes(title="Item Outlet Sales")
-    return _style_fig(fig, f"Sales Distribution by {cat_col} (Box Plot)", height=420)
-
-
-# ---------- Heatmap (optional advanced) ----------
-
-def fig_corr_heatmap(
-    df: pd.DataFrame,
-    cols: list[str] | None = None,
-):
-    """
-    Correlation matrix of selected numerical columns.
-    Default: Item_Weight, Item_MRP, Item_Visibility, Item_Outlet_Sales
-    """
-    if cols is None:
-        cols = ["Item_Weight", "Item_MRP", "Item_Visibility", "Item_Outlet_Sales"]
-    # keep only available numeric columns
-    cols = [c for c in cols if c in df.columns]
-    if not cols:
-        raise ValueError("No valid numeric columns found for correlation heatmap.")
-    corr = df[cols].apply(pd.to_numeric, errors="coerce").corr().round(2)
-    fig = px.imshow(
-        corr,
-        text_auto=True,
-        color_continuous_scale="RdBu",
-        zmin=-1,
-        zmax=1,
-        origin="lower",
-        aspect="auto",
-    )
-    fig.update_xaxes(side="bottom")
-    return _style_fig(fig, "Correlation Heatmap", height=420)
+# plots.py
+import functools
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+import polars as pl
+
+# Streamlit is only needed for caching; keep it optional so the helpers
+# stay importable from plain unit tests / notebooks.
+try:
+    import streamlit as st
+except ImportError:  # pragma: no cover
+    st = None
+
+# Numba is optional too; without it the Polars aggregate path is used.
+try:
+    from numba import njit
+except ImportError:  # pragma: no cover
+    njit = None
+
+if njit is not None:
+    @njit(cache=True, fastmath=True)
+    def _sum_by_code(codes, values, ngroups):
+        """Sum `values` into `ngroups` buckets keyed by small-int `codes`."""
+        out = np.zeros(ngroups, dtype=np.float64)
+        for i in range(codes.size):
+            out[codes[i]] += values[i]
+        return out
+else:  # pragma: no cover
+    _sum_by_code = None
+
+# ---------- caching helpers ----------
+
+# Cheap dataframe fingerprint: length + columns + content hash. Avoids
+# Streamlit pickling the whole frame just to build a cache key.
+_DF_HASH_FUNCS = {
+    pd.DataFrame: lambda d: (
+        len(d),
+        tuple(d.columns),
+        pd.util.hash_pandas_object(d, index=False).sum(),
+    )
+}
+
+def _cache_data(func):
+    """st.cache_data keyed on the dataframe fingerprint; no-op without Streamlit."""
+    if st is None:
+        return func
+    return st.cache_data(show_spinner=False, hash_funcs=_DF_HASH_FUNCS)(func)
+
+def _cache_fig(func):
+    """
+    Cache a figure builder. The dict form of the figure is what gets pickled
+    (cheap), and a go.Figure is rebuilt from it on every cache hit.
+    """
+    if st is None:
+        return func
+
+    @st.cache_data(show_spinner=False, hash_funcs=_DF_HASH_FUNCS)
+    @functools.wraps(func)
+    def _build_dict(*args, **kwargs):
+        return func(*args, **kwargs).to_dict()
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        return go.Figure(_build_dict(*args, **kwargs))
+
+    return wrapper
+
+
+# ---------- shared styling helpers ----------
+
+DEFAULT_TEMPLATE = "plotly_white"
+
+def _style_fig(fig, title=None, height=360):
+    """Uniform look & feel for all charts."""
+    if title:
+        fig.update_layout(title=dict(text=title, x=0.02, xanchor="left"))
+    fig.update_layout(
+        template=DEFAULT_TEMPLATE,
+        height=height,
+        margin=dict(t=60, r=16, b=16, l=16),
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="left", x=0),
+        hovermode="closest",
+        bargap=0.15,
+        font=dict(size=12),
+    )
+    return fig
+
+def _ensure_cols(df: pd.DataFrame, cols):
+    # load_data stashes a frozenset of the columns for O(1) lookups; frames
+    # built elsewhere fall back to scanning df.columns.
+    have = df.attrs.get("_cols") or df.columns
+    missing = [c for c in cols if c not in have]
+    if missing:
+        raise ValueError(f"Missing required columns: {missing}")
+
+
+# ---------- downsampling ----------
+
+# Point budget for raw-row traces; beyond this the browser does the suffering.
+MAX_TRACE_POINTS = 3000
+
+def _lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets downsampling (expects x sorted ascending).
+    Returns the indices of the rows to keep, so callers can subset a frame
+    and preserve any other columns (color, hover) alongside x/y.
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    bins = np.linspace(1, n - 1, n_out - 1, dtype=np.intp)
+    out = np.empty(n_out, dtype=np.intp)
+    out[0], out[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = bins[i], bins[i + 1]
+        nxt_hi = bins[i + 2] if i + 2 <= n_out - 2 else n
+        avg_x = x[hi:nxt_hi].mean()
+        avg_y = y[hi:nxt_hi].mean()
+        # pick the point forming the largest triangle with the previous
+        # selection and the next bucket's centroid
+        area = np.abs(
+            (x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a])
+        )
+        a = lo + int(area.argmax())
+        out[i + 1] = a
+    return out
+
+
+# ---------- precomputed aggregates ----------
+
+# Every grouping dimension the dashboard charts against.
+AGG_COLUMNS = (
+    "Item_Type",
+    "Outlet_Type",
+    "Outlet_Size",
+    "Outlet_Location_Type",
+    "Outlet_Identifier",
+)
+
+@_cache_data
+def sales_aggregates(df: pd.DataFrame) -> dict:
+    """
+    Total sales per group for every dashboard dimension, computed in one pass
+    over a narrowed frame. The KPI/figure helpers accept these via `agg=` so a
+    rerun does one scan of the sales column instead of six.
+    """
+    _ensure_cols(df, ["Item_Outlet_Sales"])
+    cols = [c for c in AGG_COLUMNS if c in df.columns]
+    narrow = df[cols + ["Item_Outlet_Sales"]]
+    return {c: _group_sum(narrow, c) for c in cols}
+
+def _group_sum(df: pd.DataFrame, group_col: str) -> pd.Series:
+    """
+    Total sales per group for one column. For categorical columns without
+    missing values: already-sorted codes are reduced run-by-run with
+    np.add.reduceat (pure sequential access), unsorted ones go through the
+    jitted code-bucket kernel. Everything else takes the Polars hash-aggregate.
+    """
+    col = df[group_col]
+    if isinstance(col.dtype, pd.CategoricalDtype):
+        codes = col.cat.codes.to_numpy()
+        if codes.size and not (codes < 0).any():  # -1 marks NaN; Polars keeps its group
+            values = df["Item_Outlet_Sales"].to_numpy(np.float32)
+            index = col.cat.categories.rename(group_col)
+            if not (np.diff(codes) < 0).any():
+                # load_data sorts by Item_Type, so its codes arrive sorted:
+                # sum each contiguous run instead of bucketizing.
+                starts = np.flatnonzero(np.diff(codes, prepend=-1))
+                sums = np.zeros(len(index))
+                sums[codes[starts]] = np.add.reduceat(values, starts, dtype=np.float64)
+                return pd.Series(sums, index=index, name="Item_Outlet_Sales")
+            if _sum_by_code is not None:
+                sums = _sum_by_code(codes, values, len(index))
+                return pd.Series(sums, index=index, name="Item_Outlet_Sales")
+    return _pl_group_sum(
+        pl.from_pandas(df[[group_col, "Item_Outlet_Sales"]], rechunk=True), group_col
+    )
+
+def _pl_group_sum(pldf: pl.DataFrame, group_col: str) -> pd.Series:
+    """Groupby-sum in Polars, returned as a pandas Series indexed by group."""
+    g = (
+        pldf.group_by(group_col)
+        .agg(pl.col("Item_Outlet_Sales").sum())
+        .to_pandas()
+    )
+    return g.set_index(group_col)["Item_Outlet_Sales"]
+
+def _grouped_sales(df: pd.DataFrame, group_col: str, agg: pd.Series | None = None):
+    """Total sales per group, reusing a precomputed aggregate when given."""
+    if agg is not None:
+        return agg
+    _ensure_cols(df, ["Item_Outlet_Sales", group_col])
+    return _group_sum(df, group_col)
+
+
+# ---------- KPI cards (numbers to show in st.metric) ----------
+
+@_cache_data
+def kpi_total_sales(df: pd.DataFrame) -> float:
+    """Total sales across all rows."""
+    _ensure_cols(df, ["Item_Outlet_Sales"])
+    return float(df["Item_Outlet_Sales"].sum())
+
+@_cache_data
+def kpi_avg_sales_per_item(df: pd.DataFrame) -> float:
+    """Average sales per row/item."""
+    _ensure_cols(df, ["Item_Outlet_Sales"])
+    return float(df["Item_Outlet_Sales"].mean())
+
+@_cache_data
+def kpi_highest_selling_category(
+    df: pd.DataFrame, cat_col: str = "Item_Type", agg: pd.Series | None = None
+) -> dict:
+    """Highest selling product category (by total sales)."""
+    g = _grouped_sales(df, cat_col, agg)
+    if g.empty:
+        return {"category": None, "total_sales": 0.0}
+    # idxmax is an O(n) scan; no need to sort the whole series for the top entry.
+    idx = g.idxmax()
+    return {"category": idx, "total_sales": float(g.loc[idx])}
+
+@_cache_data
+def kpi_best_outlet(df: pd.DataFrame, agg: pd.Series | None = None) -> dict:
+    """Best performing outlet (Outlet_Identifier if present, else Outlet_Type)."""
+    outlet_col = "Outlet_Identifier" if "Outlet_Identifier" in df.columns else "Outlet_Type"
+    g = _grouped_sales(df, outlet_col, agg)
+    if g.empty:
+        return {"outlet": None, "total_sales": 0.0}
+    idx = g.idxmax()
+    return {"outlet": idx, "total_sales": float(g.loc[idx])}
+
+
+# ---------- Line chart (trend) ----------
+
+@_cache_fig
+def fig_sales_trend(
+    df: pd.DataFrame, date_col: str | None = None, freq: str = "M"
+):
+    """
+    Sales trend over time.
+    - If `date_col` provided and exists: group by period (freq='M','Q','Y').
+    - Else if 'Outlet_Establishment_Year' exists: line over that year.
+    - Else: fallback to index order (not a real time series, but shows progression).
+    """
+    _ensure_cols(df, ["Item_Outlet_Sales"])
+    s = df["Item_Outlet_Sales"]
+
+    if date_col and date_col in df.columns:
+        dt = pd.to_datetime(df[date_col], errors="coerce")
+        d = (
+            pd.DataFrame({"_dt": dt, "sales": s})
+            .dropna(subset=["_dt"])
+            .groupby(pd.Grouper(key="_dt", freq=freq))
+            .sum()
+            .reset_index()
+            .rename(columns={"sales": "total_sales"})
+        )
+        fig = px.line(d, x="_dt", y="total_sales", markers=True)
+        return _style_fig(fig, f"Sales Trend ({freq}-periods)")
+    elif "Outlet_Establishment_Year" in df.columns:
+        d = (
+            df.dropna(subset=["Outlet_Establishment_Year"])
+            .groupby("Outlet_Establishment_Year")["Item_Outlet_Sales"].sum()
+            .reset_index(name="total_sales")
+        )
+        fig = px.line(d, x="Outlet_Establishment_Year", y="total_sales", markers=True)
+        fig.update_xaxes(title="Year")
+        return _style_fig(fig, "Sales by Outlet Establishment Year")
+    else:
+        # Index keys are already unique — grouping by them was a no-op copy.
+        idx = np.arange(len(s), dtype=np.int32)
+        vals = s.to_numpy()
+        if len(vals) > MAX_TRACE_POINTS:
+            keep = _lttb_indices(idx, vals, MAX_TRACE_POINTS)
+            idx, vals = idx[keep], vals[keep]
+        d = pd.DataFrame({"idx": idx, "total_sales": vals})
+        # scattergl keeps the browser responsive once the trace gets big.
+        render_mode = "webgl" if len(d) > 5000 else "auto"
+        fig = px.line(d, x="idx", y="total_sales", markers=True, render_mode=render_mode)
+        fig.update_xaxes(title="Index (no date column found)")
+        return _style_fig(fig, "Sales Trend (Index Order)")
+
+
+# ---------- Sales distribution by price (Item_MRP) ----------
+
+@_cache_fig
+def fig_mrp_distribution(df: pd.DataFrame, bins: int = 30, show_quantiles: bool = True):
+    """
+    Histogram of Item_MRP to reveal price clusters; quantile lines highlight 'sweet spots'.
+    """
+    _ensure_cols(df, ["Item_MRP"])
+    # Bin server-side: the figure carries ~`bins` bars instead of every raw
+    # MRP value, and the browser has nothing left to aggregate.
+    arr = df["Item_MRP"].to_numpy(dtype=np.float64)
+    arr = arr[~np.isnan(arr)]
+    counts, edges = np.histogram(arr, bins=bins) if arr.size else (np.zeros(bins), np.arange(bins + 1.0))
+    centers = 0.5 * (edges[:-1] + edges[1:])
+    fig = go.Figure(go.Bar(x=centers, y=counts, width=np.diff(edges), opacity=0.9))
+    fig.update_xaxes(title="Item_MRP")
+    fig.update_yaxes(title="Count")
+    if show_quantiles and arr.size:
+        # One pass for all three quantiles; the numeric value goes in x —
+        # previously the label string was passed, mispositioning the line.
+        q1, q2, q3 = np.quantile(arr, [0.25, 0.5, 0.75])
+        for x, label in zip((q1, q2, q3), ("Q1", "Median", "Q3")):
+            fig.add_vline(
+                x=float(x),
+                line_dash="dot",
+                opacity=0.6,
+                annotation_text=label,
+                annotation_position="top",
+            )
+    return _style_fig(fig, "Sales Distribution by Item_MRP (Pricing Landscape)")
+
+
+# ---------- Bar charts (comparisons) ----------
+
+def _bar_series(
+    df: pd.DataFrame,
+    group_col: str,
+    top_n: int | None = None,
+    horizontal=True,
+    agg: pd.Series | None = None,
+):
+    g = (
+        _grouped_sales(df, group_col, agg)
+        .sort_values(ascending=False)
+        .reset_index(name="total_sales")
+    )
+    if top_n:
+        g = g.head(top_n)
+    # preserve sort order in categorical axis
+    order = g[group_col].astype(str).tolist()
+
+    if horizontal:
+        fig = px.bar(
+            g, x="total_sales", y=group_col,
+            orientation="h",
+            category_orders={group_col: order},
+            labels={"total_sales": "Total Sales"}
+        )
+    else:
+        fig = px.bar(
+            g, x=group_col, y="total_sales",
+            category_orders={group_col: order},
+            labels={"total_sales": "Total Sales"}
+        )
+    return fig
+
+@_cache_fig
+def fig_sales_by_item_type(
+    df: pd.DataFrame, top_n: int | None = None, agg: pd.Series | None = None
+):
+    fig = _bar_series(df, "Item_Type", top_n=top_n, horizontal=True, agg=agg)
+    return _style_fig(fig, "Total Sales by Item Type")
+
+@_cache_fig
+def fig_sales_by_outlet_type(df: pd.DataFrame, agg: pd.Series | None = None):
+    fig = _bar_series(df, "Outlet_Type", top_n=None, horizontal=False, agg=agg)
+    return _style_fig(fig, "Total Sales by Outlet Type")
+
+@_cache_fig
+def fig_sales_by_outlet_size(df: pd.DataFrame, agg: pd.Series | None = None):
+    fig = _bar_series(df, "Outlet_Size", top_n=None, horizontal=False, agg=agg)
+    return _style_fig(fig, "Total Sales by Outlet Size")
+
+
+# ---------- Pie / Donut (proportions) ----------
+
+@_cache_fig
+def fig_location_contribution(
+    df: pd.DataFrame, hole: float = 0.5, agg: pd.Series | None = None
+):
+    """
+    Sales share by Outlet_Location_Type (Tier 1/2/3).
+    """
+    g = _grouped_sales(df, "Outlet_Location_Type", agg).reset_index(name="total_sales")
+    fig = px.pie(g, names="Outlet_Location_Type", values="total_sales", hole=hole)
+    fig.update_traces(textposition="inside", textinfo="percent+label")
+    return _style_fig(fig, "Sales Share by Location (Tier)", height=380)
+
+
+# ---------- Scatter (visibility impact) ----------
+
+@_cache_fig
+def fig_visibility_scatter(
+    df: pd.DataFrame, color: str = "Item_Type", max_points: int = MAX_TRACE_POINTS
+):
+    """
+    Item_Visibility vs Item_Outlet_Sales, colored by product category.
+    Large frames are LTTB-downsampled to `max_points` before plotting.
+    """
+    _ensure_cols(df, ["Item_Visibility", "Item_Outlet_Sales"])
+    hover = ["Outlet_Type", "Outlet_Location_Type"] if "Outlet_Type" in df.columns and "Outlet_Location_Type" in df.columns else None
+    color = color if color in df.columns else None
+    # px copies every referenced column into the figure; project to just the
+    # columns the trace actually uses so the JSON payload stays small.
+    used = ["Item_Visibility", "Item_Outlet_Sales"]
+    used += [color] if color else []
+    used += hover or []
+    df = df[used].dropna(subset=["Item_Visibility", "Item_Outlet_Sales"])
+    if max_points and len(df) > max_points:
+        # LTTB works on x-sorted data; sort, pick representative rows, and
+        # keep whole rows so color/hover columns survive the downsample.
+        order = np.argsort(df["Item_Visibility"].to_numpy(), kind="stable")
+        x = df["Item_Visibility"].to_numpy()[order]
+        y = df["Item_Outlet_Sales"].to_numpy()[order]
+        df = df.iloc[order[_lttb_indices(x, y, max_points)]]
+    fig = px.scatter(
+        df,
+        x="Item_Visibility",
+        y="Item_Outlet_Sales",
+        color=color,
+        opacity=0.6,
+        hover_data=hover,
+        trendline=None,  # set to 'ols' if statsmodels installed and you want a fitted line
+        render_mode="webgl",
+    )
+    fig.update_xaxes(title="Item Visibility")
+    fig.update_yaxes(title="Item Outlet Sales")
+    return _style_fig(fig, "Visibility vs Sales (Scatter)")
+
+
+# ---------- Box plot (spread & outliers) ----------
+
+@_cache_fig
+def fig_sales_box_by_category(df: pd.DataFrame, cat_col: str = "Item_Type", log_y: bool = False):
+    """
+    Distribution of sales per category to inspect spread & outliers.
+    """
+    _ensure_cols(df, ["Item_Outlet_Sales", cat_col])
+    sub = df[[cat_col, "Item_Outlet_Sales"]]
+    fig = px.box(sub, x=cat_col, y="Item_Outlet_Sales", points=False)
+    if log_y:
+        fig.update_yaxes(type="log")
+    fig.update_xaxes(title=cat_col.replace("_", " "))
+    fig.update_yaxes(title="Item Outlet Sales")
+    return _style_fig(fig, f"Sales Distribution by {cat_col} (Box Plot)", height=420)
+
+
+# ---------- Heatmap (optional advanced) ----------
+
+@_cache_data
+def _corr_matrix(df: pd.DataFrame, cols: tuple) -> pd.DataFrame:
+    """
+    Correlation matrix for the given columns. .corr() is O(k²·n), so for a
+    static dataset it's cached on (fingerprint, cols) and the cheap figure is
+    rebuilt around it.
+    """
+    return df[list(cols)].corr().round(2)
+
+@_cache_fig
+def fig_corr_heatmap(
+    df: pd.DataFrame,
+    cols: list[str] | None = None,
+):
+    """
+    Correlation matrix of selected numerical columns.
+    Default: Item_Weight, Item_MRP, Item_Visibility, Item_Outlet_Sales
+    """
+    if cols is None:
+        cols = ["Item_Weight", "Item_MRP", "Item_Visibility", "Item_Outlet_Sales"]
+    # keep only available numeric columns
+    cols = [c for c in cols if c in df.columns]
+    if not cols:
+        raise ValueError("No valid numeric columns found for correlation heatmap.")
+    corr = _corr_matrix(df, tuple(cols))
+    z = corr.to_numpy()
+    # go.Heatmap with pre-formatted cell labels: smaller figure JSON than
+    # px.imshow(text_auto=True) and no client-side value formatting.
+    fig = go.Figure(
+        go.Heatmap(z=z, x=cols, y=cols, zmin=-1, zmax=1, colorscale="RdBu")
+    )
+    fig.update_layout(
+        annotations=[
+            dict(x=cols[j], y=cols[i], text=f"{z[i, j]:.2f}", showarrow=False)
+            for i in range(len(cols))
+            for j in range(len(cols))
+        ]
+    )
+    fig.update_xaxes(side="bottom")
+    return _style_fig(fig, "Correlation Heatmap", height=420)
@@ -1,13 +1,75 @@
-import os
-import pandas as pd
-
-def load_data(filename="cleaned_data.csv"):
-    # Get absolute path to the folder where utils.py is located
-    base_dir = os.path.dirname(os.path.abspath(__file__))
-    # Point to /data/cleaned_data.csv relative to utils.py
-    file_path = os.path.join(base_dir, "data", filename)
-    return pd.read_csv(file_path)
-
-
-
-
+from pathlib import Path
+
+import pandas as pd
+import polars as pl
+
+try:
+    import streamlit as st
+except ImportError:  # pragma: no cover
+    st = None
+
+
+def _maybe_cache(func):
+    if st is None:
+        return func
+    return st.cache_data(ttl=None, show_spinner="Loading data…")(func)
+
+
+# Low-cardinality string columns grouped on by the dashboard.
+_CATEGORICAL_COLS = (
+    "Item_Type",
+    "Outlet_Type",
+    "Outlet_Size",
+    "Outlet_Location_Type",
+    "Outlet_Identifier",
+)
+# Measures that fit comfortably in float32.
+_NUMERIC_COLS = (
+    "Item_Outlet_Sales",
+    "Item_MRP",
+    "Item_Visibility",
+    "Item_Weight",
+    "Outlet_Establishment_Year",
+)
+
+
+def _optimize_dtypes(df):
+    """
+    Shrink the frame: float32 for measures (half the bytes to scan) and
+    category dtype for grouping columns (groupby runs on small int codes).
+    Numeric coercion happens once here so the plot helpers can use the
+    columns directly instead of re-coercing per call.
+    """
+    for c in _CATEGORICAL_COLS:
+        if c in df.columns:
+            df[c] = df[c].astype("category")
+    for c in _NUMERIC_COLS:
+        if c in df.columns:
+            df[c] = pd.to_numeric(df[c], errors="coerce", downcast="float")
+    # Sort by the most-grouped dimension: group reductions then scan
+    # contiguous runs (plots._group_sum has a reduceat path for sorted codes).
+    if "Item_Type" in df.columns:
+        df = df.sort_values("Item_Type", kind="stable").reset_index(drop=True)
+    # O(1) membership set for the per-chart column checks in plots.py.
+    df.attrs["_cols"] = frozenset(df.columns)
+    return df
+
+
+def _materialize_parquet(csv_path, parquet_path):
+    """One-time CSV → parquet conversion so later loads skip parsing entirely."""
+    df = pl.read_csv(csv_path).to_pandas(use_pyarrow_extension_array=True)
+    df.to_parquet(parquet_path, compression="zstd")
+    return df
+
+
+@_maybe_cache
+def load_data(filename="cleaned_data.csv"):
+    # resolve() pins one canonical path to /data next to this file, so every
+    # import route produces the same cache key (no duplicate loads).
+    file_path = Path(__file__).resolve().parent / "data" / filename
+    # Prefer the parquet sidecar (no re-parse); fall back to Polars'
+    # multithreaded CSV reader and materialize the sidecar for next time.
+    parquet_path = file_path.with_suffix(".parquet")
+    if parquet_path.exists():
+        return _optimize_dtypes(pd.read_parquet(parquet_path))
+    return _optimize_dtypes(_materialize_parquet(file_path, parquet_path))